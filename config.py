@@ -20,18 +20,56 @@ limitations under the License.
 import os
 import json
 import logging
+import functools
+
+# Optional: orjson encodes/decodes much faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Torrent Downloader Configuration
 TORRENT_SESSION_FILE = "torrent_session.json"
+TORRENT_RESUME_DIR = "torrent_resume"  # One <info-hash>.fastresume file per paused torrent
 TORRENT_DOWNLOAD_PATH = "../SeedUp Downloads"
+SESSION_SAVE_INTERVAL = 60  # seconds between periodic resume data saves
+RATE_SMOOTHING = 0.2  # EWMA weight of the newest download rate sample (1 disables smoothing)
+PERFORMANCE_PROFILE = "balanced"  # "balanced" keeps libtorrent defaults, "high_perf" for fast links
+CONNECTIONS_LIMIT = None  # Max peer connections per session, None keeps the profile's value
+ACTIVE_DOWNLOADS = None  # Max torrents downloading at once, None keeps the profile's value
+TORRENT_MAX_CONNECTIONS = 500  # Max peer connections per torrent; also what peer turnover measures against
+# Peer turnover only runs near a connection cap: once a torrent has PEER_TURNOVER_CUTOFF percent of
+# TORRENT_MAX_CONNECTIONS peers, or the session that percent of its connections_limit
+PEER_TURNOVER = 5  # Percent of slowest peers dropped at each turnover to make room for new ones
+PEER_TURNOVER_CUTOFF = 90  # Percent of a connection cap in use before peers are turned over
+PEER_TURNOVER_INTERVAL = 60  # seconds between peer turnovers
+HIGH_PERFORMANCE_SETTINGS = {
+    'connection_speed': 100,
+    'connections_limit': 8000,
+    'listen_queue_size': 3000,
+    'unchoke_slots_limit': 2000,
+    'aio_threads': 8,
+    'close_redundant_connections': True,
+    'request_timeout': 10,
+    'peer_timeout': 20,
+    'inactivity_timeout': 20,
+    'max_failcount': 1,
+}
 
 # Google Drive Uploader Configuration
 CHUNK_SIZE = 100 * 1024 * 1024  # 100MB chunks for large files
 MAX_RETRIES = 3
+HTTP_TIMEOUT = 60  # seconds before an idle Drive API connection times out
 RETRY_DELAY = 2  # seconds base delay for exponential backoff
 LARGE_FILE_THRESHOLD = 1024 * 1024 * 1024  # 1GB
+SIMPLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024  # Files below 5MB use a single multipart request
 MAX_WORKERS = 3  # Number of parallel uploads
+BATCH_LIMIT = 100  # Maximum number of calls in one Drive batch request
+BUNDLE_MIN_FILES = 50  # Bundle a folder's small files once it has at least this many
+BUNDLE_MAX_FILE_SIZE = 10 * 1024 * 1024  # Only files below 10MB are bundled
+BUNDLE_SPOOL_SIZE = 64 * 1024 * 1024  # Bundles above 64MB are built on disk
 PROGRESS_FILE = '.gdrive_upload_progress.json'
+PROGRESS_SAVE_INTERVAL = 50  # Save the upload record every N uploaded files
 CONFIG_FILE = '.gdrive-uploader.conf'
 TOKEN_FILE = 'token.pickle'
 CREDENTIALS_FILE = 'credentials.dat'
@@ -48,6 +86,32 @@ def get_logger(name):
     return logging.getLogger(name)
 
 
+def set_verbose(enabled: bool = True):
+    """Enable DEBUG logging, including per-file upload messages."""
+    logging.getLogger().setLevel(logging.DEBUG if enabled else logging.INFO)
+
+
+def json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+def json_loads(data: bytes):
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_json(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a JSON file, memoized by path and file version (mtime and size)."""
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
 class ConfigManager:
     """Manage configuration file for storing default settings."""
     
@@ -57,8 +121,9 @@ class ConfigManager:
         logger = get_logger(__name__)
         if os.path.exists(config_path):
             try:
-                with open(config_path, 'r') as f:
-                    return json.load(f)
+                # Re-parsed only when the file changes; copy so callers cannot mutate the cache
+                stat = os.stat(config_path)
+                return dict(_load_json(config_path, stat.st_mtime_ns, stat.st_size))
             except Exception as e:
                 logger.warning(f"Could not load config file: {e}")
         return {}
@@ -68,8 +133,8 @@ class ConfigManager:
         """Save configuration to file."""
         logger = get_logger(__name__)
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            with open(config_path, 'wb') as f:
+                f.write(json_dumps(config, indent=True))
             logger.info(f"Configuration saved to {config_path}")
         except Exception as e:
             logger.error(f"Could not save config file: {e}")
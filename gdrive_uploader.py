@@ -22,8 +22,19 @@ No manual service setup required - just run your upload commands directly.
 """
 
 import os
+import time
+import random
+import functools
+import hashlib
 import mimetypes
-from typing import Dict, List, Optional
+import queue
+import tarfile
+import tempfile
+import threading
+from collections import deque
+from http.client import HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 from tqdm import tqdm
 import logging
 
@@ -35,29 +46,188 @@ import warnings
 warnings.filterwarnings("ignore", message="No project ID could be determined")
 warnings.filterwarnings("ignore", message="file_cache is only supported with oauth2client")
 
-from googleapiclient.http import MediaFileUpload
+import google.auth
+import google_auth_httplib2
+import httplib2
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
 
-from config import get_logger
+from config import (BATCH_LIMIT, BUNDLE_MAX_FILE_SIZE, BUNDLE_MIN_FILES, BUNDLE_SPOOL_SIZE,
+                    CHUNK_SIZE, HTTP_TIMEOUT, MAX_RETRIES, MAX_WORKERS, PROGRESS_FILE,
+                    PROGRESS_SAVE_INTERVAL, RETRY_DELAY, SIMPLE_UPLOAD_THRESHOLD, get_logger,
+                    json_dumps, json_loads)
 
 logger = get_logger(__name__)
-# Suppress INFO level logging to reduce verbose output
-logger.setLevel(logging.WARNING)
 
 # Check if running in Google Colab
 try:
     from google.colab import auth
     from googleapiclient.discovery import build
     IN_COLAB = True
-    logger.info("Running in Google Colab environment")
+    logger.debug("Running in Google Colab environment")
 except ImportError:
     IN_COLAB = False
     logger.warning("Not running in Google Colab - upload features unavailable")
 
+NOT_IN_COLAB_MESSAGE = "Not running in Google Colab environment"
+AUTH_FAILED_MESSAGE = "Failed to authenticate Google Drive: "
+SEEDUP_FOLDER_FAILED_MESSAGE = "Failed to create/access SeedUp Downloads folder in Google Drive"
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+# Drive query strings need backslashes and single quotes escaped
+QUERY_ESCAPE = str.maketrans({'\\': '\\\\', "'": "\\'"})
+# Bundle file lists longer than this are cut off in the Drive description
+BUNDLE_MANIFEST_LIMIT = 16000
+# appProperties key holding the digest of the files a bundle was built from
+BUNDLE_DIGEST_PROPERTY = 'seedupBundleDigest'
+SEEDUP_FOLDER_QUERY = (f"name='SeedUp Downloads' and mimeType='{FOLDER_MIME_TYPE}' "
+                       "and trashed=false and 'root' in parents")
+
+
+class ScanEntry(NamedTuple):
+    """A file or folder found by SimpleDriveUploader.scan()."""
+    path: str
+    name: str
+    parent: str
+    size: int
+    is_dir: bool
+
+
+def _escape_query(value: str) -> str:
+    """Escape a value for use inside a quoted Drive query string."""
+    return value.translate(QUERY_ESCAPE)
+
+
+# HTTP statuses worth retrying, plus the 403 reasons Drive uses for rate limiting
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+RATE_LIMIT_REASONS = (b'rateLimitExceeded', b'userRateLimitExceeded')
+
+
+def _is_retryable(error: HttpError) -> bool:
+    """Check whether a Drive API error is a rate limit or transient server error."""
+    status = error.resp.status
+    if status in RETRYABLE_STATUSES:
+        return True
+    content = error.content or b''
+    return status == 403 and any(reason in content for reason in RATE_LIMIT_REASONS)
+
+
+def with_backoff(fn):
+    """
+    Retry a Drive API call with exponential backoff on retryable errors.
+    
+    Rate limits, transient server errors and dropped connections are retried.
+    Waits RETRY_DELAY * 2^attempt seconds plus jitter between attempts, or the
+    server's Retry-After value when one is sent, for up to MAX_RETRIES retries.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return fn(*args, **kwargs)
+            except HttpError as e:
+                if attempt == MAX_RETRIES or not _is_retryable(e):
+                    raise
+                retry_after = e.resp.get('retry-after', '')
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+                else:
+                    delay = RETRY_DELAY * (2 ** attempt) + random.random()
+                logger.warning(f"Drive API error {e.resp.status}, retrying in {delay:.1f}s "
+                               f"({attempt + 1}/{MAX_RETRIES})")
+            except HTTPException as e:
+                # httplib2 re-raises these (IncompleteRead, BadStatusLine, ...) after one reconnect
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = RETRY_DELAY * (2 ** attempt) + random.random()
+                logger.warning(f"Connection error ({type(e).__name__}), retrying in {delay:.1f}s "
+                               f"({attempt + 1}/{MAX_RETRIES})")
+            time.sleep(delay)
+    return wrapper
+
+
+@with_backoff
+def _execute(request):
+    """Execute a Drive API request with retries."""
+    return request.execute()
+
+
+@with_backoff
+def _next_chunk(request):
+    """Upload the next chunk of a resumable request with retries."""
+    return request.next_chunk()
+
+
+class _ProgressReader:
+    """File wrapper that reports the stream position after each read."""
+    
+    def __init__(self, stream, report: Callable[[int], None]):
+        self._stream = stream
+        self._report = report
+    
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._report(self._stream.tell())
+        return data
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class ProgressMediaFileUpload(MediaFileUpload):
+    """MediaFileUpload that reports bytes to a callback as they are read for sending."""
+    
+    def __init__(self, filename: str, progress: Optional[Callable[[int], None]] = None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._progress = progress
+        self._reported = 0
+    
+    def _report(self, end: int):
+        # Bytes re-read after a retry are only counted once
+        if self._progress and end > self._reported:
+            self._progress(end - self._reported)
+            self._reported = end
+    
+    def stream(self):
+        # Resumable chunks are streamed, so count bytes as the HTTP client reads them
+        return _ProgressReader(super().stream(), self._report)
+    
+    def getbytes(self, begin, length):
+        # Multipart uploads read the whole file here
+        data = super().getbytes(begin, length)
+        self._report(begin + len(data))
+        return data
+
+
+@functools.lru_cache(maxsize=512)
+def _guess_mime(ext: str) -> str:
+    """Guess the MIME type for a file extension, memoized per extension."""
+    return mimetypes.guess_type('x' + ext)[0] or 'application/octet-stream'
+
+
+def _bundle_name(local_paths: List[str]) -> str:
+    """Name of the tar archive bundling files from one folder."""
+    return f"{os.path.basename(os.path.dirname(local_paths[0]))}.bundle.tar"
+
+
+def _bundle_digest(local_paths: List[str]) -> str:
+    """Digest of the names, sizes and modification times of the files in a bundle."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(local_paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
 def get_drive_service():
     """
     Get authenticated Google Drive service.
     
+    The service is built once per process and reused; set_drive_service()
+    clears it so the next call authenticates again.
+    
     Returns:
         Google Drive service object
         
@@ -65,7 +235,7 @@ def get_drive_service():
         RuntimeError: If not in Colab or authentication fails
     """
     if not IN_COLAB:
-        raise RuntimeError("Not running in Google Colab environment")
+        raise RuntimeError(NOT_IN_COLAB_MESSAGE)
     
     try:
         # Suppress warnings during authentication
@@ -73,10 +243,30 @@ def get_drive_service():
             warnings.simplefilter("ignore")
             # Authenticate and build service directly like your working script
             auth.authenticate_user()
-            drive_service = build('drive', 'v3')
-            return drive_service
+            return build_drive_service()
     except Exception as e:
-        raise RuntimeError(f"Failed to authenticate Google Drive: {str(e)}")
+        raise RuntimeError(AUTH_FAILED_MESSAGE + str(e))
+
+
+def build_drive_service():
+    """
+    Build a Drive service with its own keep-alive HTTP connection.
+    
+    Each service owns one httplib2 connection pool that is reused for every API
+    call made through it, so TLS is only negotiated once per service. Services
+    are not thread-safe; build one per thread.
+    
+    Returns:
+        Google Drive service object using application default credentials
+    """
+    credentials, _ = google.auth.default()
+    http = google_auth_httplib2.AuthorizedHttp(
+        credentials,
+        http=httplib2.Http(timeout=HTTP_TIMEOUT)
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return build('drive', 'v3', http=http, cache_discovery=False)
 
 
 def get_or_create_seedup_folder(drive_service) -> Optional[str]:
@@ -91,30 +281,28 @@ def get_or_create_seedup_folder(drive_service) -> Optional[str]:
     """
     try:
         # Search for existing SeedUp Downloads folder in root
-        query = "name='SeedUp Downloads' and mimeType='application/vnd.google-apps.folder' and trashed=false and 'root' in parents"
-        
-        results = drive_service.files().list(
-            q=query,
+        results = _execute(drive_service.files().list(
+            q=SEEDUP_FOLDER_QUERY,
             fields='files(id, name)',
             pageSize=1
-        ).execute()
+        ))
         
         folders = results.get('files', [])
         if folders:
-            logger.info(f"Found existing SeedUp Downloads folder: {folders[0]['id']}")
+            logger.debug(f"Found existing SeedUp Downloads folder: {folders[0]['id']}")
             return folders[0]['id']
         
         # Create new SeedUp Downloads folder if not found
         folder_metadata = {
             'name': 'SeedUp Downloads',
-            'mimeType': 'application/vnd.google-apps.folder'
+            'mimeType': FOLDER_MIME_TYPE
         }
-        folder = drive_service.files().create(
+        folder = _execute(drive_service.files().create(
             body=folder_metadata,
             fields='id'
-        ).execute()
+        ))
         folder_id = folder.get('id')
-        logger.info(f"Created new SeedUp Downloads folder: {folder_id}")
+        logger.debug(f"Created new SeedUp Downloads folder: {folder_id}")
         return folder_id
         
     except HttpError as e:
@@ -127,61 +315,183 @@ def get_or_create_seedup_folder(drive_service) -> Optional[str]:
 
 # For backward compatibility - these functions are no longer needed but kept for existing code
 def set_drive_service(service):
-    """Legacy function - no longer needed with automatic authentication."""
-    logger.info("Drive service set (using automatic authentication)")
+    """Legacy function - resets the cached service so the next upload authenticates again."""
+    get_drive_service.cache_clear()
+    logger.debug("Drive service set (using automatic authentication)")
 
 class SimpleDriveUploader:
     """Simplified Google Drive uploader with progress bars and skip existing feature."""
     
-    def __init__(self, skip_existing: bool = True, use_seedup_folder: bool = True):
+    def __init__(self, skip_existing: bool = True, use_seedup_folder: bool = True,
+                 bundle_small_files: bool = False):
         """
         Initialize the uploader with automatic authentication.
         
         Args:
             skip_existing: If True, skip files that already exist in Drive
             use_seedup_folder: If True, automatically create/use SeedUp Downloads folder in Drive root
+            bundle_small_files: If True, upload folders with many small files as one tar archive
             
         Raises:
             RuntimeError: If not in Colab or authentication fails
         """
         self.drive_service = get_drive_service()
+        # Drive service objects are not thread-safe, so each upload worker gets its own
+        self._local = threading.local()
+        self._local.drive_service = self.drive_service
+        self._lock = threading.Lock()
         self.skip_existing = skip_existing
         self.use_seedup_folder = use_seedup_folder
+        self.bundle_small_files = bundle_small_files
         self.seedup_folder_id = None
+        # Cached folder listings: parent_id -> {child name: file info}
+        self._children_cache: Dict[str, Dict[str, Dict]] = {}
+        # The subfolders of each cached listing, kept apart so a file cannot hide a folder of the same name
+        self._folder_cache: Dict[str, Dict[str, Dict]] = {}
+        # Files uploaded by this and previous runs: parent_id -> {file name: {'id', 'mtime'}}
+        self._uploaded = self.load_progress()
+        self._unsaved_uploads = 0
         
         # Get or create SeedUp Downloads folder if enabled
         if self.use_seedup_folder:
             self.seedup_folder_id = get_or_create_seedup_folder(self.drive_service)
             if not self.seedup_folder_id:
-                raise RuntimeError("Failed to create/access SeedUp Downloads folder in Google Drive")
+                raise RuntimeError(SEEDUP_FOLDER_FAILED_MESSAGE)
     
-    def file_exists(self, file_name: str, parent_id: str) -> Optional[Dict]:
+    @staticmethod
+    def load_progress(progress_path: str = PROGRESS_FILE) -> Dict[str, Dict[str, Dict]]:
+        """Load the record of previously uploaded files."""
+        if os.path.exists(progress_path):
+            try:
+                with open(progress_path, 'rb') as f:
+                    return json_loads(f.read())
+            except Exception as e:
+                logger.warning(f"Could not load upload progress file: {e}")
+        return {}
+    
+    def save_progress(self, progress_path: str = PROGRESS_FILE):
+        """Write the record of uploaded files, replacing the old file atomically."""
+        temp_path = progress_path + '.tmp'
+        try:
+            with self._lock:
+                with open(temp_path, 'wb') as f:
+                    f.write(json_dumps(self._uploaded))
+                os.replace(temp_path, progress_path)
+                self._unsaved_uploads = 0
+        except OSError as e:
+            logger.error(f"Could not save upload progress file: {e}")
+    
+    def uploaded_file_id(self, local_path: str, parent_id: str) -> Optional[str]:
         """
-        Check if a file with the given name already exists in the parent folder.
+        Look up a file in the local upload record without querying Drive.
         
         Args:
-            file_name: Name of the file to check
+            local_path: Path to the local file
             parent_id: Parent folder ID
             
         Returns:
-            File info dict if exists, None otherwise
+            Drive file ID if this exact file (same name and mtime) was uploaded before, None otherwise
         """
+        uploaded = self._uploaded.get(parent_id, {}).get(os.path.basename(local_path))
+        if not uploaded:
+            return None
         try:
-            # Escape single quotes in filename for query
-            escaped_name = file_name.replace("'", "\\'")
-            query = f"name='{escaped_name}' and '{parent_id}' in parents and trashed=false"
+            if uploaded.get('mtime') == os.path.getmtime(local_path):
+                return uploaded['id']
+        except OSError:
+            pass
+        return None
+    
+    def _record_upload(self, local_path: str, parent_id: str, file_id: str, mtime: float):
+        """Remember an uploaded file, saving the record every PROGRESS_SAVE_INTERVAL uploads."""
+        with self._lock:
+            self._uploaded.setdefault(parent_id, {})[os.path.basename(local_path)] = {
+                'id': file_id,
+                'mtime': mtime
+            }
+            self._unsaved_uploads += 1
+            save_due = self._unsaved_uploads >= PROGRESS_SAVE_INTERVAL
+        if save_due:
+            self.save_progress()
+    
+    def _service(self):
+        """Return the Drive service owned by the calling thread."""
+        drive_service = getattr(self._local, 'drive_service', None)
+        if drive_service is None:
+            drive_service = build_drive_service()
+            self._local.drive_service = drive_service
+        return drive_service
+    
+    def list_children(self, parent_id: str) -> Dict[str, Dict]:
+        """
+        List the children of a Drive folder, caching the result per parent.
+        
+        The whole folder is fetched with one paged `files().list` query instead of
+        one query per child, so existence checks during a recursive upload cost a
+        single round-trip per directory.
+        
+        Args:
+            parent_id: Parent folder ID
             
-            results = self.drive_service.files().list(
+        Returns:
+            Dictionary mapping child name to its file info dict
+            
+        Raises:
+            HttpError: If the listing request fails
+        """
+        children = self._children_cache.get(parent_id)
+        if children is not None:
+            return children
+        
+        children = {}
+        folders = {}
+        query = f"'{_escape_query(parent_id)}' in parents and trashed=false"
+        page_token = None
+        while True:
+            results = _execute(self._service().files().list(
                 q=query,
-                fields='files(id, name, size, mimeType)',
-                pageSize=1
-            ).execute()
+                fields='nextPageToken, files(id, name, size, mimeType, appProperties)',
+                pageSize=1000,
+                pageToken=page_token
+            ))
             
-            files = results.get('files', [])
-            if files:
-                return files[0]
-            return None
+            for item in results.get('files', []):
+                # Keep the first match, like the old pageSize=1 name query did
+                children.setdefault(item['name'], item)
+                if item.get('mimeType') == FOLDER_MIME_TYPE:
+                    folders.setdefault(item['name'], item)
             
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        
+        with self._lock:
+            self._children_cache[parent_id] = children
+            self._folder_cache[parent_id] = folders
+        return children
+    
+    def _remember_child(self, parent_id: str, item: Dict):
+        """Record a newly created item in the cached listing of its parent."""
+        with self._lock:
+            children = self._children_cache.get(parent_id)
+            if children is not None:
+                children.setdefault(item['name'], item)
+                if item.get('mimeType') == FOLDER_MIME_TYPE:
+                    self._folder_cache[parent_id].setdefault(item['name'], item)
+    
+    def file_exists(self, file_name: str, parent_id: str) -> Optional[Dict]:
+        """
+        Check if a file with the given name already exists in the parent folder.
+        
+        Args:
+            file_name: Name of the file to check
+            parent_id: Parent folder ID
+            
+        Returns:
+            File info dict if exists, None otherwise
+        """
+        try:
+            return self.list_children(parent_id).get(file_name)
         except HttpError as e:
             logger.error(f"Error checking if file exists: {str(e)}")
             return None
@@ -198,79 +508,90 @@ class SimpleDriveUploader:
             Folder ID if exists, None otherwise
         """
         try:
-            # Escape single quotes in folder name for query
-            escaped_name = folder_name.replace("'", "\\'")
-            query = (f"name='{escaped_name}' and '{parent_id}' in parents "
-                    f"and mimeType='application/vnd.google-apps.folder' and trashed=false")
-            
-            results = self.drive_service.files().list(
-                q=query,
-                fields='files(id, name)',
-                pageSize=1
-            ).execute()
-            
-            folders = results.get('files', [])
-            if folders:
-                return folders[0]['id']
-            return None
-            
+            self.list_children(parent_id)
         except HttpError as e:
             logger.error(f"Error checking if folder exists: {str(e)}")
             return None
+        
+        existing = self._folder_cache[parent_id].get(folder_name)
+        return existing['id'] if existing else None
     
-    def upload_file(self, local_path: str, parent_id: str) -> Optional[str]:
+    def upload_file(self, local_path: str, parent_id: str,
+                    progress: Optional[Callable[[int], None]] = None) -> Optional[str]:
         """
         Upload a single file to Google Drive with progress bar.
         
         Args:
             local_path: Path to the local file
             parent_id: Google Drive folder ID where file will be uploaded
+            progress: Optional callback receiving the number of bytes read for sending
             
         Returns:
             File ID if successful, None otherwise
         """
         file_name = os.path.basename(local_path)
         
-        # Check if file already exists
+        # Check if file already exists, trusting the local upload record first
         if self.skip_existing:
+            uploaded_id = self.uploaded_file_id(local_path, parent_id)
+            if uploaded_id:
+                return uploaded_id
             existing = self.file_exists(file_name, parent_id)
             if existing:
                 return existing['id']
         
         # Detect MIME type
-        mime_type, _ = mimetypes.guess_type(local_path)
-        if not mime_type:
-            mime_type = 'application/octet-stream'
+        mime_type = _guess_mime(os.path.splitext(local_path)[1].lower())
         
         # Prepare file metadata
         file_metadata = {'name': file_name, 'parents': [parent_id]}
         
         try:
-            # Create resumable upload
-            media = MediaFileUpload(
-                local_path,
-                mimetype=mime_type,
-                resumable=True
-            )
-            request = self.drive_service.files().create(
+            # Read the mtime before sending, so a file changed mid-upload is not recorded as uploaded
+            stat = os.stat(local_path)
+            if stat.st_size < SIMPLE_UPLOAD_THRESHOLD:
+                # Small files go up in a single multipart request
+                media = ProgressMediaFileUpload(
+                    local_path,
+                    progress=progress,
+                    mimetype=mime_type,
+                    resumable=False
+                )
+            else:
+                # Large files use a resumable upload; CHUNK_SIZE only makes the chunk size
+                # configurable, its 100MB default is the same as googleapiclient's
+                media = ProgressMediaFileUpload(
+                    local_path,
+                    progress=progress,
+                    mimetype=mime_type,
+                    chunksize=CHUNK_SIZE,
+                    resumable=True
+                )
+            request = self._service().files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id'
+                fields='id, name, size, mimeType'
             )
             
-            # Upload without individual progress bar
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
+            # Progress is reported by the media object as chunks are read
+            if media.resumable():
+                response = None
+                while response is None:
+                    status, response = _next_chunk(request)
+            else:
+                response = _execute(request)
             
+            self._remember_child(parent_id, response)
             file_id = response.get('id')
+            self._record_upload(local_path, parent_id, file_id, stat.st_mtime)
+            logger.debug(f"Uploaded '{file_name}' ({file_id})")
             return file_id
             
         except HttpError as e:
             logger.error(f"HTTP error uploading '{file_name}': {str(e)}")
             return None
-        except Exception as e:
-            logger.error(f"Unexpected error uploading '{file_name}': {str(e)}")
+        except (HttpLib2Error, HTTPException, OSError) as e:
+            logger.error(f"Network or file error uploading '{file_name}': {str(e)}")
             return None
     
     def create_folder(self, folder_name: str, parent_id: str) -> Optional[str]:
@@ -293,19 +614,145 @@ class SimpleDriveUploader:
         try:
             folder_metadata = {
                 'name': folder_name,
-                'mimeType': 'application/vnd.google-apps.folder',
+                'mimeType': FOLDER_MIME_TYPE,
                 'parents': [parent_id]
             }
-            folder = self.drive_service.files().create(
+            folder = _execute(self._service().files().create(
                 body=folder_metadata,
-                fields='id'
-            ).execute()
-            folder_id = folder.get('id')
-            return folder_id
-        except Exception as e:
+                fields='id, name, mimeType'
+            ))
+            return self._folder_created(parent_id, folder)
+        except (HttpError, HttpLib2Error, HTTPException, OSError) as e:
             logger.error(f"Error creating folder '{folder_name}': {str(e)}")
             return None
     
+    def _folder_created(self, parent_id: str, folder: Dict) -> str:
+        """Record a newly created folder in the listing cache and return its ID."""
+        self._remember_child(parent_id, folder)
+        # A freshly created folder is known to be empty
+        folder_id = folder.get('id')
+        with self._lock:
+            self._children_cache[folder_id] = {}
+            self._folder_cache[folder_id] = {}
+        logger.debug(f"Created folder '{folder.get('name')}' ({folder_id})")
+        return folder_id
+    
+    def create_folders(self, folders: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Create several folders, sending the creations as Drive batch requests.
+        
+        All folders must have existing parents, e.g. one level of a folder tree.
+        Up to BATCH_LIMIT creations share a single HTTP request; any that fail
+        inside a batch are retried one by one through create_folder.
+        
+        Args:
+            folders: List of (folder_name, parent_id) tuples
+            
+        Returns:
+            List of folder IDs in the same order, None where creation failed
+        """
+        folder_ids = [None] * len(folders)
+        
+        # Reuse existing folders first (one cached listing per parent)
+        pending = []
+        for index, (folder_name, parent_id) in enumerate(folders):
+            existing_id = self.folder_exists(folder_name, parent_id) if self.skip_existing else None
+            if existing_id:
+                folder_ids[index] = existing_id
+            else:
+                pending.append(index)
+        
+        if len(pending) == 1:
+            folder_name, parent_id = folders[pending[0]]
+            folder_ids[pending[0]] = self.create_folder(folder_name, parent_id)
+            return folder_ids
+        
+        def on_folder_created(request_id, response, exception):
+            if exception is None:
+                index = int(request_id)
+                folder_ids[index] = self._folder_created(folders[index][1], response)
+        
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            batch = self._service().new_batch_http_request(callback=on_folder_created)
+            for index in chunk:
+                folder_name, parent_id = folders[index]
+                folder_metadata = {
+                    'name': folder_name,
+                    'mimeType': FOLDER_MIME_TYPE,
+                    'parents': [parent_id]
+                }
+                batch.add(
+                    self._service().files().create(body=folder_metadata, fields='id, name, mimeType'),
+                    request_id=str(index)
+                )
+            try:
+                _execute(batch)
+            except (HttpError, HttpLib2Error, HTTPException, OSError) as e:
+                logger.warning(f"Batch folder creation failed, creating folders individually: {str(e)}")
+            
+            # Fall back to single requests (with backoff) for anything the batch did not create
+            for index in chunk:
+                if folder_ids[index] is None:
+                    folder_name, parent_id = folders[index]
+                    folder_ids[index] = self.create_folder(folder_name, parent_id)
+        
+        return folder_ids
+    
+    def scan(self, local_path: str, errors: Optional[List[str]] = None) -> Iterator[ScanEntry]:
+        """
+        Walk a file or folder once with os.scandir, breadth-first.
+        
+        The walk uses an explicit queue instead of recursion, so deep trees cost no
+        Python call-stack depth, and every folder is yielded before its children.
+        The queue carries DirEntry objects, whose name, path, type and stat data
+        come from the directory read itself, so no extra stat() call or path
+        parsing is needed per entry. Symlinks inside the tree are skipped, so a link
+        cannot pull in files from elsewhere or loop back into the tree.
+        
+        Args:
+            local_path: Path to the local file or folder
+            errors: Optional list that unreadable or unsupported paths are appended to
+            
+        Yields:
+            ScanEntry tuples, starting with local_path itself
+        """
+        name = os.path.basename(local_path)
+        parent = os.path.dirname(local_path)
+        if not os.path.isdir(local_path):
+            yield ScanEntry(local_path, name, parent, os.path.getsize(local_path), False)
+            return
+        
+        yield ScanEntry(local_path, name, parent, 0, True)
+        queue = deque([local_path])
+        while queue:
+            folder = queue.popleft()
+            # The root is a path string, every other queued folder a DirEntry
+            folder_path = folder if isinstance(folder, str) else folder.path
+            try:
+                with os.scandir(folder) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.error(f"Error reading folder '{folder_path}': {str(e)}")
+                if errors is not None:
+                    errors.append(folder_path)
+                continue
+            
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        logger.info(f"Skipping symlink '{entry.path}'")
+                    elif entry.is_dir(follow_symlinks=False):
+                        yield ScanEntry(entry.path, entry.name, folder_path, 0, True)
+                        queue.append(entry)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield ScanEntry(entry.path, entry.name, folder_path, entry.stat().st_size, False)
+                    elif errors is not None:
+                        errors.append(entry.path)
+                except OSError:
+                    if errors is not None:
+                        errors.append(entry.path)
+    
     def count_items(self, local_path: str) -> Dict[str, int]:
         """
         Count total files and folders in the path.
@@ -316,45 +763,145 @@ class SimpleDriveUploader:
         Returns:
             Dictionary with files, folders, and total_size counts
         """
-        if os.path.isfile(local_path):
-            return {
-                'files': 1,
-                'folders': 0,
-                'total_size': os.path.getsize(local_path)
-            }
-        
         files = 0
         folders = 0
         total_size = 0
         
         try:
-            for root, dirs, filenames in os.walk(local_path):
-                folders += len(dirs)
-                files += len(filenames)
-                
-                for filename in filenames:
-                    try:
-                        file_path = os.path.join(root, filename)
-                        total_size += os.path.getsize(file_path)
-                    except OSError:
-                        pass
-        except Exception as e:
+            for entry in self.scan(local_path):
+                if entry.is_dir:
+                    if entry.path != local_path:
+                        folders += 1
+                else:
+                    files += 1
+                    total_size += entry.size
+        except OSError as e:
             logger.error(f"Error counting items: {str(e)}")
         
         return {'files': files, 'folders': folders, 'total_size': total_size}
     
-    def upload_to_drive(
-        self,
-        local_path: str,
-        parent_id: str,
-        _progress_bar=None,
-        _total_size=None,
-        _uploaded_size=[0],
-        _file_count=[0, 0]  # [current, total]
-    ) -> Dict[str, any]:
+    def _upload_task(self, local_path: str, parent_id: str, progress: Callable[[int], None]) -> str:
+        """
+        Upload or skip a single file. Runs on a worker thread.
+        
+        Returns:
+            'success', 'failed' or 'skipped'
+        """
+        if self.skip_existing and (self.uploaded_file_id(local_path, parent_id)
+                                   or self.file_exists(os.path.basename(local_path), parent_id)):
+            return 'skipped'
+        return 'success' if self.upload_file(local_path, parent_id, progress) else 'failed'
+    
+    def upload_bundle(self, local_paths: List[str], parent_id: str) -> Optional[str]:
+        """
+        Upload several small files from one folder as a single tar archive.
+        
+        The archive is named after the folder and its file list is stored in the
+        Drive description. It is built in a spooled temporary file, so only
+        archives larger than BUNDLE_SPOOL_SIZE touch the disk. When skipping
+        existing files, a bundle built from the same files is kept, and one built
+        before files were added or changed is replaced in place.
+        
+        Args:
+            local_paths: Paths of the files to bundle, all in the same local folder
+            parent_id: Google Drive folder ID where the archive will be uploaded
+            
+        Returns:
+            File ID of the archive if successful, None otherwise
+        """
+        return self._send_bundle(local_paths, parent_id)[1]
+    
+    def _send_bundle(self, local_paths: List[str], parent_id: str) -> Tuple[str, Optional[str]]:
+        """Upload a bundle unless it is up to date; returns the task status and the archive's file ID."""
+        bundle_name = _bundle_name(local_paths)
+        
+        try:
+            # Stat the files before archiving them, so changes made during the upload show up next run
+            digest = _bundle_digest(local_paths)
+            existing = self.file_exists(bundle_name, parent_id) if self.skip_existing else None
+            if existing and existing.get('appProperties', {}).get(BUNDLE_DIGEST_PROPERTY) == digest:
+                return 'skipped', existing['id']
+            
+            manifest = '\n'.join(os.path.basename(path) for path in local_paths)
+            file_metadata = {
+                'name': bundle_name,
+                'description': manifest[:BUNDLE_MANIFEST_LIMIT],
+                'appProperties': {BUNDLE_DIGEST_PROPERTY: digest}
+            }
+            
+            with tempfile.SpooledTemporaryFile(max_size=BUNDLE_SPOOL_SIZE) as spool:
+                with tarfile.open(fileobj=spool, mode='w') as tar:
+                    for path in local_paths:
+                        tar.add(path, arcname=os.path.basename(path))
+                spool.seek(0)
+                
+                media = MediaIoBaseUpload(
+                    spool,
+                    mimetype='application/x-tar',
+                    chunksize=CHUNK_SIZE,
+                    resumable=True
+                )
+                if existing:
+                    # Files were added or changed since this bundle was uploaded
+                    request = self._service().files().update(
+                        fileId=existing['id'],
+                        body=file_metadata,
+                        media_body=media,
+                        fields='id, name, size, mimeType, appProperties'
+                    )
+                else:
+                    file_metadata['parents'] = [parent_id]
+                    request = self._service().files().create(
+                        body=file_metadata,
+                        media_body=media,
+                        fields='id, name, size, mimeType, appProperties'
+                    )
+                response = None
+                while response is None:
+                    status, response = _next_chunk(request)
+            
+            if existing:
+                with self._lock:
+                    existing.update(response)
+            else:
+                self._remember_child(parent_id, response)
+            logger.debug(f"Uploaded bundle '{bundle_name}' with {len(local_paths)} files ({response.get('id')})")
+            return 'success', response.get('id')
+        
+        except HttpError as e:
+            logger.error(f"HTTP error uploading bundle '{bundle_name}': {str(e)}")
+            return 'failed', None
+        except (HttpLib2Error, HTTPException, OSError, tarfile.TarError) as e:
+            logger.error(f"Network or file error uploading bundle '{bundle_name}': {str(e)}")
+            return 'failed', None
+    
+    def _bundle_task(self, local_paths: List[str], parent_id: str, progress: Callable[[int], None]) -> str:
+        """
+        Upload a bundle of small files. Runs on a worker thread.
+        
+        Returns:
+            'success', 'failed' or 'skipped'
+        """
+        return self._send_bundle(local_paths, parent_id)[0]
+    
+    def _create_level(self, level: List[ScanEntry], folder_ids: Dict[str, str], results: Dict):
+        """Create one level of pending folders with create_folders and record their IDs."""
+        created = self.create_folders([(entry.name, folder_ids[entry.parent]) for entry in level])
+        for entry, folder_id in zip(level, created):
+            if folder_id:
+                folder_ids[entry.path] = folder_id
+            else:
+                results['failed'].append(entry.path)
+        level.clear()
+    
+    def upload_to_drive(self, local_path: str, parent_id: str) -> Dict[str, any]:
         """
         Upload a file or folder to Google Drive recursively.
         
+        The tree is scanned once and uploads start as soon as files are found:
+        folders are created level by level with batch requests while files are
+        uploaded in parallel using up to MAX_WORKERS threads.
+        
         Args:
             local_path: Path to the local file or folder
             parent_id: Google Drive folder ID where content will be uploaded
@@ -370,93 +917,124 @@ class SimpleDriveUploader:
             results['failed'].append(local_path)
             return results
         
-        # Initialize progress tracking on first call
-        if _progress_bar is None:
-            stats = self.count_items(local_path)
-            _total_size = stats['total_size']
-            _file_count[1] = stats['files']  # total files
-            _uploaded_size[0] = 0
-            _file_count[0] = 0  # current file count
-            
-            size_mb = _total_size / (1024 * 1024)
-            print(f"📤 Uploading {stats['files']} files ({size_mb:.1f} MB)")
-            _progress_bar = tqdm(
-                total=_total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-                desc="Upload",
-                bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{rate_fmt}] {postfix}",
-                disable=False,
-                leave=True,
-                ncols=100
-            )
+        local_path = os.path.normpath(local_path)
+        print(f"📤 Uploading {local_path}")
+        # The total grows as the scan discovers files
+        progress_bar = tqdm(
+            total=0,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+            desc="Upload",
+            bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{rate_fmt}] {postfix}",
+            disable=False,
+            leave=True,
+            ncols=100
+        )
+        file_count = [0, 0]  # [current, discovered]
+        
+        # Finished uploads are handed back to this thread, which owns results
+        completed = queue.SimpleQueue()
+        progress_lock = threading.Lock()
+        # Bound the queued uploads, so the scan waits for the workers instead of queueing the whole tree
+        slots = threading.BoundedSemaphore(2 * MAX_WORKERS)
         
-        # Upload file
-        if os.path.isfile(local_path):
-            file_name = os.path.basename(local_path)
-            file_size = os.path.getsize(local_path)
-            existing = self.file_exists(file_name, parent_id) if self.skip_existing else None
+        def advance(num_bytes):
+            with progress_lock:
+                progress_bar.update(num_bytes)
+        
+        def submit(task, target, paths, pid, size):
+            sent = [0]
             
-            if existing:
-                results['skipped'].append(local_path)
-                # Update progress even for skipped files
-                if _progress_bar:
-                    _uploaded_size[0] += file_size
-                    _file_count[0] += 1
-                    _progress_bar.set_postfix_str(f"Files: {_file_count[0]}/{_file_count[1]}")
-                    _progress_bar.update(file_size)
+            def on_progress(num_bytes):
+                sent[0] += num_bytes
+                advance(num_bytes)
+            
+            def on_done(future):
+                slots.release()
+                completed.put((paths, size - sent[0], future))
+            
+            slots.acquire()
+            try:
+                future = executor.submit(task, target, pid, on_progress)
+            except BaseException:
+                slots.release()
+                raise
+            future.add_done_callback(on_done)
+        
+        def finish(paths, unsent, future):
+            results[future.result()].extend(paths)
+            # Account for bytes never sent (skipped, failed or bundled files)
+            file_count[0] += len(paths)
+            with progress_lock:
+                progress_bar.set_postfix_str(f"Files: {file_count[0]}/{file_count[1]}", refresh=False)
+                progress_bar.update(max(unsent, 0))
+        
+        bundle = []  # Small files of the folder being scanned, when bundling
+        
+        def flush_bundle():
+            pid = folder_ids[bundle[0].parent]
+            if len(bundle) >= BUNDLE_MIN_FILES:
+                paths = [entry.path for entry in bundle]
+                submit(self._bundle_task, paths, paths, pid, sum(entry.size for entry in bundle))
             else:
-                file_id = self.upload_file(local_path, parent_id)
-                if file_id:
-                    results['success'].append(local_path)
-                else:
-                    results['failed'].append(local_path)
+                for entry in bundle:
+                    submit(self._upload_task, entry.path, [entry.path], pid, entry.size)
+            bundle.clear()
+        
+        folder_ids = {os.path.dirname(local_path): parent_id}
+        level = []  # Folders found but not yet created; always a single tree level
+        
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        # Keep the upload record and close the bar even if a worker error or Ctrl+C stops the upload
+        try:
+            for entry in self.scan(local_path, results['failed']):
+                if level and entry.parent not in folder_ids:
+                    # BFS reached the children of the pending level: create it in one batch
+                    self._create_level(level, folder_ids, results)
                 
-                # Update progress after upload
-                if _progress_bar:
-                    _uploaded_size[0] += file_size
-                    _file_count[0] += 1
-                    _progress_bar.set_postfix_str(f"Files: {_file_count[0]}/{_file_count[1]}")
-                    _progress_bar.update(file_size)
+                if entry.parent not in folder_ids:
+                    # Parent folder could not be created
+                    results['failed'].append(entry.path)
+                elif entry.is_dir:
+                    level.append(entry)
+                else:
+                    file_count[1] += 1
+                    with progress_lock:
+                        progress_bar.total += entry.size
+                    if self.bundle_small_files and entry.size < BUNDLE_MAX_FILE_SIZE:
+                        # A folder's entries are scanned together, so a new parent ends the bundle
+                        if bundle and bundle[0].parent != entry.parent:
+                            flush_bundle()
+                        bundle.append(entry)
+                    else:
+                        submit(self._upload_task, entry.path, [entry.path], folder_ids[entry.parent], entry.size)
                 
-            return results
-        
-        # Upload directory
-        if os.path.isdir(local_path):
-            folder_name = os.path.basename(local_path)
-            folder_id = self.create_folder(folder_name, parent_id)
+                while not completed.empty():
+                    finish(*completed.get())
             
-            if folder_id:
-                # Store the created folder ID as root folder for this upload
-                results['root_folder_id'] = folder_id
-                
-                # Recursively upload all items in the folder
-                try:
-                    for item in os.listdir(local_path):
-                        item_path = os.path.join(local_path, item)
-                        sub_results = self.upload_to_drive(item_path, folder_id, _progress_bar, _total_size, _uploaded_size, _file_count)
-                        results['success'].extend(sub_results['success'])
-                        results['failed'].extend(sub_results['failed'])
-                        results['skipped'].extend(sub_results['skipped'])
-                except Exception as e:
-                    results['failed'].append(local_path)
-            else:
-                results['failed'].append(local_path)
+            if level:
+                self._create_level(level, folder_ids, results)
+            if bundle:
+                flush_bundle()
             
-            # Close progress bar if this is the root call and we're done
-            if _progress_bar and _file_count[0] >= _file_count[1]:
-                _progress_bar.close()
-                print()  # Add newline after progress bar
-                
-            return results
-        
-        # Close progress bar if this is the root call
-        if _progress_bar and _file_count[0] >= _file_count[1]:
-            _progress_bar.close()
+            while file_count[0] < file_count[1]:
+                finish(*completed.get())
+            
+            executor.shutdown()
+        except BaseException:
+            # Drop the queued uploads; only the ones already running are finished
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            progress_bar.close()
             print()  # Add newline after progress bar
+            self.save_progress()
+        
+        if local_path in folder_ids:
+            # Store the created folder ID as root folder for this upload
+            results['root_folder_id'] = folder_ids[local_path]
         
-        results['failed'].append(local_path)
         return results
     
     def print_summary(self, results: Dict[str, List[str]], root_folder_id: str = None):
@@ -479,6 +1057,8 @@ class SimpleDriveUploader:
             print(f"\n📁 View uploaded files: {folder_url}")
         
         print("="*60)
+        logger.info(f"Upload finished: {len(results['success'])} uploaded, "
+                    f"{len(results.get('skipped', []))} skipped, {len(results['failed'])} failed")
 
 
 def upload_to_google_drive(local_path: str, folder_id: str = None, **kwargs):
@@ -492,6 +1072,7 @@ def upload_to_google_drive(local_path: str, folder_id: str = None, **kwargs):
         **kwargs: Additional options:
             - skip_existing (bool): Skip files that already exist (default: True)
             - use_seedup_folder (bool): Use SeedUp Downloads folder in Drive root (default: True)
+            - bundle_small_files (bool): Upload folders with many small files as one tar archive (default: False)
         
     Returns:
         Dictionary with 'success', 'failed', and 'skipped' lists
@@ -500,9 +1081,14 @@ def upload_to_google_drive(local_path: str, folder_id: str = None, **kwargs):
         RuntimeError: If not in Colab or authentication fails
     """
     skip_existing = kwargs.get('skip_existing', True)
+    bundle_small_files = kwargs.get('bundle_small_files', False)
     use_seedup_folder = (folder_id is None)
 
-    uploader = SimpleDriveUploader(skip_existing=skip_existing, use_seedup_folder=use_seedup_folder)
+    uploader = SimpleDriveUploader(
+        skip_existing=skip_existing,
+        use_seedup_folder=use_seedup_folder,
+        bundle_small_files=bundle_small_files
+    )
 
     # Resolve destination: custom folder_id takes priority
     if folder_id is None:
@@ -27,7 +27,7 @@ import os
 from pathlib import Path
 
 from torrent_downloader import download_torrent, get_download_status, clear_session
-from config import ConfigManager, TORRENT_DOWNLOAD_PATH, get_logger
+from config import ConfigManager, TORRENT_DOWNLOAD_PATH, PERFORMANCE_PROFILE, get_logger, set_verbose
 
 logger = get_logger(__name__)
 
@@ -59,6 +59,9 @@ Examples:
   python main.py download -t movie.torrent
   python main.py download -t "magnet:?xt=urn:btih:..."
   
+  # Download with settings tuned for fast connections
+  python main.py download -t movie.torrent --profile high_perf
+  
   # Download and upload to Google Drive (Colab only)
   python main.py download -t movie.torrent --upload -f FOLDER_ID
   
@@ -68,17 +71,29 @@ Examples:
   # Upload without skipping existing files
   python main.py upload -p /path -f FOLDER_ID --no-skip
   
+  # Bundle folders of many small files into one tar archive each
+  python main.py upload -p /path --bundle
+  
   # Check for paused downloads
   python main.py status
   
   # Clear download session
   python main.py clear
   
+  # Show every uploaded file and created folder
+  python main.py --verbose upload -p /path/to/folder
+  
 Note: Upload features automatically handle authentication in Google Colab.
 Just run your commands directly - no manual setup required!
         """
     )
     
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Show debug logging, including every uploaded file and created folder'
+    )
+    
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
     # Download command
@@ -87,7 +102,7 @@ Just run your commands directly - no manual setup required!
         '-t', '--torrent',
         type=str,
         required=True,
-        help='Torrent file path or magnet link'
+        help='Torrent file path, .torrent URL or magnet link'
     )
     download_parser.add_argument(
         '-d', '--destination',
@@ -100,6 +115,12 @@ Just run your commands directly - no manual setup required!
         action='store_true',
         help='Start fresh download (ignore previous session)'
     )
+    download_parser.add_argument(
+        '--profile',
+        choices=['balanced', 'high_perf'],
+        default=PERFORMANCE_PROFILE,
+        help=f'libtorrent performance profile (default: {PERFORMANCE_PROFILE})'
+    )
     download_parser.add_argument(
         '--upload',
         action='store_true',
@@ -115,6 +136,11 @@ Just run your commands directly - no manual setup required!
         action='store_true',
         help='Force re-upload even if files exist in Drive'
     )
+    download_parser.add_argument(
+        '--bundle',
+        action='store_true',
+        help='Upload folders with many small files as a single tar archive'
+    )
     
     # Upload command
     upload_parser = subparsers.add_parser('upload', help='Upload files to Google Drive (Colab only)')
@@ -134,6 +160,11 @@ Just run your commands directly - no manual setup required!
         action='store_true',
         help='Force re-upload even if files exist in Drive'
     )
+    upload_parser.add_argument(
+        '--bundle',
+        action='store_true',
+        help='Upload folders with many small files as a single tar archive'
+    )
     
     # Status command
     subparsers.add_parser('status', help='Check download status')
@@ -155,7 +186,8 @@ def handle_download(args):
     downloaded_path = download_torrent(
         args.torrent,
         download_path=args.destination,
-        auto_resume=not args.no_resume
+        auto_resume=not args.no_resume,
+        profile=args.profile
     )
     
     if not downloaded_path:
@@ -177,7 +209,8 @@ def handle_download(args):
             results = upload_to_google_drive(
                 downloaded_path,
                 args.folder_id,  # Can be None, will use SeedUp folder
-                skip_existing=not args.no_skip
+                skip_existing=not args.no_skip,
+                bundle_small_files=args.bundle
             )
             
             if results['failed']:
@@ -226,7 +259,8 @@ def handle_upload(args):
         results = upload_to_google_drive(
             args.path,
             args.folder_id,
-            skip_existing=not args.no_skip
+            skip_existing=not args.no_skip,
+            bundle_small_files=args.bundle
         )
         
         if results['failed']:
@@ -286,6 +320,9 @@ def main():
         parse_arguments().print_help()
         return 1
     
+    if args.verbose:
+        set_verbose()
+    
     try:
         # Route to appropriate handler
         if args.command == 'download':
@@ -18,13 +18,47 @@ limitations under the License.
 """
 
 import libtorrent as lt
+import asyncio
+import atexit
+import functools
+import threading
 import time
 import os
 import sys
-from config import TORRENT_SESSION_FILE, TORRENT_DOWNLOAD_PATH, get_logger
+import hashlib
+import heapq
+import re
+import urllib.request
+from dataclasses import dataclass
+from queue import Empty, SimpleQueue
+from typing import Optional
+from config import (
+    TORRENT_SESSION_FILE, TORRENT_RESUME_DIR, TORRENT_DOWNLOAD_PATH, SESSION_SAVE_INTERVAL, RATE_SMOOTHING,
+    PERFORMANCE_PROFILE, HIGH_PERFORMANCE_SETTINGS, CONNECTIONS_LIMIT, ACTIVE_DOWNLOADS,
+    TORRENT_MAX_CONNECTIONS, PEER_TURNOVER, PEER_TURNOVER_CUTOFF, PEER_TURNOVER_INTERVAL,
+    HTTP_TIMEOUT, get_logger
+)
 
 logger = get_logger(__name__)
 
+KB = 1 << 10
+MB = 1 << 20
+BAR_LENGTH = 30
+
+# Classifies a download source as a magnet link, an http(s) URL or a .torrent file path
+_SOURCE_RE = re.compile(r"^(?:(?P<magnet>magnet:)|(?P<http>https?://)|(?P<file>.*\.torrent$))", re.I)
+
+# Extra flags for opening session files (not every platform has all of them)
+_OPEN_FLAGS = getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+
+# Digest of the last data written to each session/resume file, to skip unchanged saves
+_saved_digests = {}
+
+# Process-wide session shared by all downloads and its alert router, see get_session()
+_session = None
+_router = None
+_session_lock = threading.Lock()
+
 # Check if running in Google Colab
 try:
     from google.colab import files
@@ -33,91 +67,492 @@ except ImportError:
     IN_COLAB = False
 
 
+class _SessionFile:
+    """
+    A session or resume file, read and written with raw os calls.
+    
+    Files are opened with O_NOFOLLOW so a symlink at the path is never followed,
+    and a missing file is detected from the failed open rather than a separate
+    stat(). Writes still go to a temp file that is moved into place: rewriting
+    the file in place would leave it torn if the process died mid-save.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def read(self):
+        """
+        Read the whole file.
+        
+        :return: File contents, or None if the file does not exist.
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY | _OPEN_FLAGS)
+        except FileNotFoundError:
+            return None
+        try:
+            return os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+    
+    def write(self, data):
+        """
+        Replace the file with new contents atomically, unless they are unchanged since the last write.
+        
+        :param data: Bytes to store.
+        :return: True if the file was written, False if the contents were unchanged.
+        """
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if _saved_digests.get(self.path) == digest:
+            return False
+        
+        temp_path = self.path + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _OPEN_FLAGS, 0o600)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(temp_path, self.path)
+        _saved_digests[self.path] = digest
+        return True
+    
+    def remove(self):
+        """
+        Delete the file.
+        
+        :return: True if the file was removed, False if it did not exist.
+        """
+        _saved_digests.pop(self.path, None)
+        try:
+            os.remove(self.path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
 def save_session(session, session_file=TORRENT_SESSION_FILE):
-    """Save session state to resume later (correctly saves binary data)."""
+    """Save session state (DHT nodes and settings), replacing the old file atomically."""
     try:
-        with open(session_file, "wb") as f:
-            session_state = session.save_state()
-            f.write(lt.bencode(session_state))
-        logger.debug(f"Session saved to {session_file}")
+        if _SessionFile(session_file).write(lt.bencode(session.save_state())):
+            logger.debug(f"Session saved to {session_file}")
     except Exception as e:
         logger.error(f"Failed to save session: {e}")
 
 
+def _resume_file(resume_dir, info_hash):
+    """Return the resume data file of the torrent with the given info-hash."""
+    return os.path.join(resume_dir, f"{info_hash}.fastresume")
+
+
+def save_resume_data(params, resume_file):
+    """
+    Save a torrent's resume data, replacing the old file atomically.
+    
+    :param params: add_torrent_params delivered by a save_resume_data_alert.
+    :param resume_file: File to write the resume data to.
+    """
+    try:
+        if _SessionFile(resume_file).write(lt.write_resume_data_buf(params)):
+            logger.debug(f"Resume data saved to {resume_file}")
+    except Exception as e:
+        logger.error(f"Failed to save resume data: {e}")
+
+
+def load_resume_data(resume_file):
+    """
+    Load a torrent's resume data if it exists.
+    
+    :param resume_file: File the resume data was saved to.
+    :return: add_torrent_params to add the torrent with, or None.
+    """
+    try:
+        resume_data = _SessionFile(resume_file).read()
+        if resume_data is None:
+            return None
+        return lt.read_resume_data(resume_data)
+    except (RuntimeError, ValueError, OSError) as e:
+        logger.warning(f"Failed to load resume data ({e}). Starting fresh.")
+        return None
+
+
 def load_session(session_file=TORRENT_SESSION_FILE):
     """Load session state if exists, otherwise return a new session."""
-    if os.path.exists(session_file):
-        try:
-            with open(session_file, "rb") as f:
-                session_data = f.read()
-                if not session_data:
-                    raise ValueError("Session file is empty.")
-                
-                session_state = lt.bdecode(session_data)
-                ses = lt.session()
-                ses.load_state(session_state)
-                logger.info(f"Session loaded from {session_file}")
-                return ses
-        except (RuntimeError, ValueError) as e:
-            logger.warning(f"Failed to load session ({e}). Starting fresh.")
-            os.remove(session_file)
+    try:
+        session_data = _SessionFile(session_file).read()
+        if session_data is not None:
+            if not session_data:
+                raise ValueError("Session file is empty.")
+            
+            session_state = lt.bdecode(session_data)
+            ses = lt.session()
+            ses.load_state(session_state)
+            logger.info(f"Session loaded from {session_file}")
+            return ses
+    except (RuntimeError, ValueError, OSError) as e:
+        logger.warning(f"Failed to load session ({e}). Starting fresh.")
+        _SessionFile(session_file).remove()
     
     return lt.session()
 
 
-def download_torrent(source, download_path=TORRENT_DOWNLOAD_PATH, 
-                    session_file=TORRENT_SESSION_FILE, auto_resume=True):
+def _params_from_magnet(source):
+    """Build add_torrent_params for a magnet link."""
+    try:
+        params = lt.parse_magnet_uri(source)
+        logger.info(f"Adding magnet link: {source[:60]}...")
+        return params
+    except Exception as e:
+        logger.error(f"Invalid magnet link: {e}")
+        return None
+
+
+def _params_from_url(source):
+    """Build add_torrent_params for a .torrent file served over http(s)."""
+    # libtorrent 2.0 no longer downloads .torrent URLs itself, so fetch it here
+    try:
+        with urllib.request.urlopen(source, timeout=HTTP_TIMEOUT) as response:
+            torrent_data = response.read()
+    except Exception as e:
+        logger.error(f"Failed to fetch torrent file: {e}")
+        return None
+    logger.info(f"Adding torrent from URL: {source}")
+    return _params_from_buffer(torrent_data)
+
+
+def _params_from_file(source):
+    """Build add_torrent_params for a local .torrent file."""
+    if not os.path.exists(source):
+        logger.error(f"Torrent file not found: {source}")
+        return None
+    
+    try:
+        # Let libtorrent load and parse the file with its own bdecoder
+        params = lt.add_torrent_params()
+        params.ti = lt.torrent_info(source)
+        logger.info(f"Adding torrent file: {source}")
+        return params
+    except Exception as e:
+        logger.error(f"Failed to read torrent file: {e}")
+        return None
+
+
+def _params_from_buffer(source):
+    """Build add_torrent_params from the raw contents of a .torrent file."""
+    try:
+        # Hand the buffer straight to libtorrent's decoder; only non-bytes buffers need a copy
+        torrent_data = source if isinstance(source, bytes) else bytes(source)
+        params = lt.add_torrent_params()
+        params.ti = lt.torrent_info(torrent_data)
+        logger.info(f"Adding torrent from memory ({len(torrent_data)} bytes)")
+        return params
+    except Exception as e:
+        logger.error(f"Failed to read torrent data: {e}")
+        return None
+
+
+_SOURCE_LOADERS = {
+    'magnet': _params_from_magnet,
+    'http': _params_from_url,
+    'file': _params_from_file,
+    'buffer': _params_from_buffer,
+}
+
+
+def _classify_source(source):
+    """Return 'magnet', 'http', 'file' or 'buffer' for a download source, or None if it is not recognised."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return 'buffer'
+    match = _SOURCE_RE.match(source)
+    return match.lastgroup if match else None
+
+
+def _info_hash(params):
+    """Return the (v1) info-hash of add_torrent_params as a hex string."""
+    if params.ti is not None:
+        return str(params.ti.info_hash())
+    if hasattr(params, 'info_hashes'):  # libtorrent 2.0+
+        return str(params.info_hashes.v1)
+    return str(params.info_hash)
+
+
+def _flush_resume_data(handle, resume_file, router, timeout=10):
+    """
+    Request fresh resume data for a torrent and wait for it to be written.
+    
+    Blocks the calling thread, so it also works while the event loop is unwinding.
+    
+    :param handle: Handle of the torrent.
+    :param resume_file: File to write the resume data to.
+    :param router: Alert router of the session the torrent belongs to.
+    :param timeout: Seconds to wait for libtorrent to deliver the data.
+    """
+    waiter = router.subscribe_blocking(handle)
+    try:
+        handle.save_resume_data(lt.torrent_handle.save_info_dict)
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                alert = waiter.get(timeout=remaining)
+            except Empty:
+                break
+            if isinstance(alert, lt.save_resume_data_alert):
+                save_resume_data(alert.params, resume_file)
+                return
+            if isinstance(alert, lt.save_resume_data_failed_alert):
+                logger.warning(f"Could not save resume data: {alert.message()}")
+                return
+        logger.warning("Timed out waiting for resume data")
+    finally:
+        router.unsubscribe(waiter)
+
+
+class _AlertRouter:
+    """
+    Pops a session's alerts on a single thread and routes them to the downloads they belong to.
+    
+    Each download subscribes with its torrent handle and reads only its own queue, so
+    concurrent downloads on one session never consume each other's alerts. Alerts are
+    handed to the subscriber's own event loop, so downloads run by separate asyncio.run()
+    calls can share the session. Statuses in a state_update_alert are routed one by one
+    as torrent_status objects.
     """
-    Download a torrent file using libtorrent, with support for stopping/resuming.
     
-    :param source: .torrent file path or magnet link.
+    def __init__(self, ses):
+        self._ses = ses
+        self._lock = threading.Lock()
+        self._subscribers = []  # (handle, queue, deliver) for each active subscription
+        self._pump = None
+    
+    def subscribe(self, handle):
+        """
+        Start routing a torrent's alerts to the running event loop.
+        
+        :param handle: Handle of the torrent.
+        :return: asyncio.Queue receiving the torrent's alerts and statuses.
+        """
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        self._add(handle, queue, functools.partial(loop.call_soon_threadsafe, queue.put_nowait))
+        return queue
+    
+    def subscribe_blocking(self, handle):
+        """
+        Start routing a torrent's alerts to a queue that can be read from any thread.
+        
+        :param handle: Handle of the torrent.
+        :return: queue.SimpleQueue receiving the torrent's alerts and statuses.
+        """
+        queue = SimpleQueue()
+        self._add(handle, queue, queue.put)
+        return queue
+    
+    def unsubscribe(self, queue):
+        """Stop routing alerts to a queue returned by subscribe() or subscribe_blocking()."""
+        with self._lock:
+            self._subscribers = [sub for sub in self._subscribers if sub[1] is not queue]
+    
+    def dispatch(self, alerts):
+        """Route popped alerts to every subscriber of their torrent; anything else is dropped."""
+        with self._lock:
+            for alert in alerts:
+                if isinstance(alert, lt.state_update_alert):
+                    for status in alert.status:
+                        self._route(status.handle, status)
+                elif isinstance(alert, lt.torrent_alert):
+                    self._route(alert.handle, alert)
+    
+    def _add(self, handle, queue, deliver):
+        with self._lock:
+            self._subscribers.append((handle, queue, deliver))
+            if self._pump is None:
+                self._pump = threading.Thread(target=self._run, name="libtorrent-alerts", daemon=True)
+                self._pump.start()
+    
+    def _route(self, handle, item):
+        for subscribed, _, deliver in self._subscribers:
+            if subscribed == handle:
+                try:
+                    deliver(item)
+                except RuntimeError:
+                    pass  # The subscriber's event loop has closed
+    
+    def _run(self):
+        # Stops once nobody is subscribed; the next subscription starts a new pump
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._pump = None
+                    return
+            self._ses.wait_for_alert(500)
+            self.dispatch(self._ses.pop_alerts())
+    
+    @staticmethod
+    async def next_alerts(queue, timeout):
+        """
+        Wait for routed alerts.
+        
+        :param queue: Queue returned by subscribe().
+        :param timeout: Seconds to wait for the first alert.
+        :return: All alerts pending on the queue, empty if none arrived in time.
+        """
+        try:
+            items = [await asyncio.wait_for(queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while not queue.empty():
+            items.append(queue.get_nowait())
+        return items
+
+
+def build_settings(profile=PERFORMANCE_PROFILE):
+    """
+    Build the session settings for a performance profile.
+    
+    :param profile: "balanced" for libtorrent defaults, "high_perf" for the
+                    high_performance_seed preset tuned with HIGH_PERFORMANCE_SETTINGS.
+    :return: Settings dict for session.apply_settings().
+    """
+    if profile == "high_perf":
+        settings = lt.high_performance_seed()
+        settings.update(HIGH_PERFORMANCE_SETTINGS)
+    elif profile == "balanced":
+        # A full default pack, so settings left by a high_perf run are reset
+        settings = lt.default_settings()
+    else:
+        raise ValueError(f"Unknown performance profile: {profile}")
+    
+    settings.update({
+        'listen_interfaces': '0.0.0.0:6881',
+        'alert_mask': (lt.alert.category_t.status_notification
+                       | lt.alert.category_t.storage_notification
+                       | lt.alert.category_t.error_notification
+                       | lt.alert.category_t.performance_warning),
+        'enable_dht': True,
+        'enable_lsd': True,
+        'enable_upnp': True,
+        'enable_natpmp': True,
+        # Periodically drop the slowest peers near a connection cap, so libtorrent can try faster ones
+        'peer_turnover': PEER_TURNOVER,
+        'peer_turnover_cutoff': PEER_TURNOVER_CUTOFF,
+        'peer_turnover_interval': PEER_TURNOVER_INTERVAL,
+    })
+    if CONNECTIONS_LIMIT is not None:
+        settings['connections_limit'] = CONNECTIONS_LIMIT
+    if ACTIVE_DOWNLOADS is not None:
+        settings['active_downloads'] = ACTIVE_DOWNLOADS
+    return settings
+
+
+def get_session(session_file=TORRENT_SESSION_FILE, profile=PERFORMANCE_PROFILE, auto_resume=True):
+    """
+    Return the process-wide libtorrent session, creating it on first use.
+    
+    Reusing one session keeps the DHT and peer caches warm between downloads.
+    Its state is saved to the session file when the process exits. Safe to call
+    from several threads; only the first call creates the session.
+    
+    :param session_file: File to load session state from when the session is created,
+                         and to save it to at exit.
+    :param profile: Performance profile to apply, "balanced" or "high_perf".
+    :param auto_resume: Load the saved session state when the session is created.
+    :return: The shared lt.session.
+    """
+    global _session, _router
+    with _session_lock:
+        if _session is None:
+            _session = load_session(session_file) if auto_resume else lt.session()
+            _router = _AlertRouter(_session)
+            atexit.register(save_session, _session, session_file)
+        _session.apply_settings(build_settings(profile))
+    return _session
+
+
+@dataclass(slots=True)
+class TorrentProgress:
+    """Snapshot of a download's progress, yielded by iter_download()."""
+    name: str
+    path: str  # Where the downloaded content is saved
+    progress: float  # Percent complete
+    seeds: int
+    peers: int  # Connected peers, including seeds
+    rate: int  # Smoothed download rate in bytes/s
+    eta: Optional[int]  # Seconds remaining, None while nothing is downloading
+    resumed: bool  # Whether the download was resumed from saved resume data
+    finished: bool = False
+
+
+@dataclass(slots=True)
+class _StatusSnapshot:
+    """The torrent_status fields the progress loop reads, copied out of libtorrent once per update."""
+    progress: float
+    seeds: int
+    peers: int
+    rate: int
+    done: int
+    total: int
+    state: int
+
+    @classmethod
+    def from_status(cls, status):
+        """Copy the fields out of a libtorrent torrent_status."""
+        return cls(status.progress, status.num_seeds, status.num_peers, status.download_rate,
+                   status.total_done, status.total_wanted, status.state)
+
+
+async def iter_download(source, download_path=TORRENT_DOWNLOAD_PATH,
+                        session_file=TORRENT_SESSION_FILE, auto_resume=True,
+                        profile=PERFORMANCE_PROFILE, resume_dir=TORRENT_RESUME_DIR):
+    """
+    Download a torrent, yielding a TorrentProgress snapshot whenever its progress changes.
+    
+    The last snapshot has finished=True. Nothing is yielded if the torrent
+    could not be added. If iteration is cancelled or interrupted, resume data
+    and session state are saved so the download can be resumed later. Resume
+    data is kept per torrent, in resume_dir/<info-hash>.fastresume.
+    
+    :param source: .torrent file path, http(s) URL of a .torrent file, magnet link,
+                   or the raw contents of a .torrent file (bytes, bytearray or memoryview).
     :param download_path: Directory to save the downloaded content.
     :param session_file: File to save/load session state.
     :param auto_resume: Automatically load previous session if available.
-    :return: Path to downloaded content or None on failure.
+    :param profile: Performance profile, "balanced" or "high_perf".
+    :param resume_dir: Directory to save/load resume data in.
     """
     if not os.path.exists(download_path):
         os.makedirs(download_path)
         logger.info(f"Created download directory: {download_path}")
 
-    # Check if we're resuming from a previous session
-    is_resuming = auto_resume and os.path.exists(session_file)
-
-    # Load existing session or create new one
-    ses = load_session(session_file) if auto_resume else lt.session()
+    # Use the shared session with the settings for the chosen performance profile
+    ses = get_session(session_file, profile, auto_resume)
+
+    # Handle magnet link, .torrent URL or .torrent file; loading may block, so run it off the event loop
+    loop = asyncio.get_running_loop()
+    kind = _classify_source(source)
+    if kind is None:
+        logger.error("Invalid source. Provide a .torrent file, .torrent URL or magnet link.")
+        return
+    params = await loop.run_in_executor(None, _SOURCE_LOADERS[kind], source)
+    if params is None:
+        return
+
+    # Resume from this torrent's own resume data, so concurrent downloads never share a file
+    os.makedirs(resume_dir, exist_ok=True)
+    resume_file = _resume_file(resume_dir, _info_hash(params))
+    is_resuming = False
+    if auto_resume:
+        resume_params = load_resume_data(resume_file)
+        if resume_params is not None:
+            params = resume_params
+            is_resuming = True
+            logger.info(f"Resuming from {resume_file}")
 
-    # Apply necessary settings
-    settings = {
-        'listen_interfaces': '0.0.0.0:6881',
-    }
-    ses.apply_settings(settings)
-
-    # Initialize add_torrent_params
-    params = lt.add_torrent_params()
     params.save_path = download_path
     params.storage_mode = lt.storage_mode_t.storage_mode_sparse
-
-    # Handle magnet link or .torrent file
-    if source.startswith("magnet:"):
-        params.url = source
-        logger.info(f"Adding magnet link: {source[:60]}...")
-    elif source.endswith(".torrent"):
-        if not os.path.exists(source):
-            logger.error(f"Torrent file not found: {source}")
-            return None
-        
-        try:
-            with open(source, "rb") as f:
-                torrent_data = lt.bdecode(f.read())
-                info = lt.torrent_info(torrent_data)
-                params.ti = info
-            logger.info(f"Adding torrent file: {source}")
-        except Exception as e:
-            logger.error(f"Failed to read torrent file: {e}")
-            return None
-    else:
-        logger.error("Invalid source. Provide a .torrent file or magnet link.")
-        return None
+    # libtorrent leaves torrents uncapped, and peer turnover needs a cap to reach before it drops slow peers
+    params.max_connections = TORRENT_MAX_CONNECTIONS
 
     # Add the torrent to the session
     try:
@@ -125,114 +560,303 @@ def download_torrent(source, download_path=TORRENT_DOWNLOAD_PATH,
         logger.info(f"Downloading to: {download_path}")
     except Exception as e:
         logger.error(f"Failed to add torrent: {e}")
-        return None
+        return
 
-    # Wait for metadata
-    logger.info("Waiting for metadata...")
-    while not handle.status().has_metadata:
-        time.sleep(1)
-
-    torrent_name = handle.status().name
-    logger.info(f"Downloading: {torrent_name}")
-
-    try:
-        while handle.status().state != lt.torrent_status.seeding:
-            s = handle.status()
-            progress = s.progress * 100
-
-            # Calculate ETA
-            eta_str = "N/A"
-            if s.download_rate > 0:
-                total_size = s.total_wanted
-                downloaded = s.total_done
-                remaining = total_size - downloaded
-                eta_seconds = remaining / s.download_rate
-                
-                if eta_seconds < 60:
-                    eta_str = f"{int(eta_seconds)}s"
-                elif eta_seconds < 3600:
-                    eta_str = f"{int(eta_seconds / 60)}m {int(eta_seconds % 60)}s"
+    router = _router
+    queue = router.subscribe(handle)
+    try:
+        # Wait for metadata, sleeping until the router hands us an alert
+        logger.info("Waiting for metadata...")
+        has_metadata = handle.status().has_metadata
+        while not has_metadata:
+            has_metadata = any(
+                isinstance(alert, lt.metadata_received_alert)
+                for alert in await router.next_alerts(queue, 5)
+            )
+
+        s = handle.status()
+        torrent_name = s.name
+        downloaded_path = os.path.join(download_path, torrent_name)
+        logger.info(f"Downloading: {torrent_name}")
+
+        snap = _StatusSnapshot.from_status(s)
+        # Periodic tasks as a heap of (due time, task), so one wait covers every cadence
+        now = time.monotonic()
+        events = [(now, 'update'), (now + SESSION_SAVE_INTERVAL, 'save')]
+        heapq.heapify(events)
+        # The finished alert may have been posted before we subscribed, so the state is checked too
+        done_states = (lt.torrent_status.seeding, lt.torrent_status.finished)
+        finished = snap.state in done_states
+        changed = True
+        last_snapshot = None
+        perf_warnings = set()
+        smooth_rate = float(snap.rate)
+        while not finished:
+            download_rate = snap.rate
+            if changed:
+                # Exponentially weighted average keeps the speed and ETA from jumping around;
+                # start from the first real sample rather than ramping up from zero
+                if smooth_rate:
+                    smooth_rate += RATE_SMOOTHING * (download_rate - smooth_rate)
                 else:
-                    hours = int(eta_seconds / 3600)
-                    minutes = int((eta_seconds % 3600) / 60)
-                    eta_str = f"{hours}h {minutes}m"
-
-            # Format download speed
-            if s.download_rate > 1024 * 1024:  # > 1 MB/s
-                speed_str = f"{s.download_rate / (1024 * 1024):.2f} MB/s"
-            else:
-                speed_str = f"{s.download_rate / 1024:.2f} KB/s"
-
-            # Build complete progress bar string manually
-            bar_length = 30
-            filled_length = int(bar_length * progress / 100)
-            bar = '█' * filled_length + '░' * (bar_length - filled_length)
-            
-            # Determine label based on actual state
-            if is_resuming and progress < 95:
-                label = "Resuming Download"
-            elif s.download_rate == 0 and s.num_peers == 0:
-                label = "Connecting to Peers"
-            else:
-                label = "Download Progress"
-                is_resuming = False  # No longer resuming once we're actively downloading
-            
-            stats_str = f"Seeds: {s.num_seeds} | Peers: {s.num_peers - s.num_seeds} | Speed: {speed_str} | ETA: {eta_str}"
-            progress_line = f"{label}: {bar} {progress:.1f}/100%    | {stats_str}"
+                    smooth_rate = float(download_rate)
+                rate = int(smooth_rate)
+                snapshot = TorrentProgress(
+                    name=torrent_name,
+                    path=downloaded_path,
+                    progress=snap.progress * 100,
+                    seeds=snap.seeds,
+                    peers=snap.peers,
+                    rate=rate,
+                    eta=(snap.total - snap.done) // rate if rate > 0 else None,
+                    resumed=is_resuming
+                )
+                # libtorrent also reports changes to fields we don't expose (upload stats etc.)
+                if snapshot != last_snapshot:
+                    last_snapshot = snapshot
+                    yield snapshot
+                changed = False
+
+            # Run the periodic tasks that are due and schedule their next run
+            now = time.monotonic()
+            while events[0][0] <= now:
+                _, task = heapq.heappop(events)
+                if task == 'update':
+                    # Ask for a batched status update, more often while data is flowing (200ms-2s);
+                    # torrents whose status has not changed are left out, so keep the last snapshot
+                    ses.post_torrent_updates()
+                    interval = min(2000, max(200, 1_000_000 // max(download_rate, 1))) / 1000
+                elif task == 'save':
+                    # Request resume data; it is written when the alert arrives
+                    handle.save_resume_data(lt.torrent_handle.save_info_dict)
+                    interval = SESSION_SAVE_INTERVAL
+                heapq.heappush(events, (now + interval, task))
             
-            # Use simple print instead of tqdm to avoid interference
-            print(f"\r{progress_line}", end="", flush=True)
+            # Sleep until an alert for this torrent arrives or the next task is due
+            for alert in await router.next_alerts(queue, events[0][0] - now):
+                if isinstance(alert, lt.torrent_status):
+                    snap = _StatusSnapshot.from_status(alert)
+                    changed = True
+                    finished = finished or snap.state in done_states
+                elif isinstance(alert, lt.torrent_finished_alert):
+                    finished = True
+                elif isinstance(alert, lt.save_resume_data_alert):
+                    save_resume_data(alert.params, resume_file)
+                elif isinstance(alert, lt.torrent_error_alert):
+                    logger.error(f"Torrent error: {alert.message()}")
+                elif isinstance(alert, lt.performance_alert):
+                    # libtorrent repeats these about once a second while the condition lasts
+                    if alert.warning_code in perf_warnings:
+                        logger.debug(f"Performance warning: {alert.message()}")
+                    else:
+                        perf_warnings.add(alert.warning_code)
+                        logger.warning(f"Performance warning: {alert.message()}")
+
+    except (KeyboardInterrupt, asyncio.CancelledError, GeneratorExit):
+        # Paused by the user or the caller stopped iterating
+        _flush_resume_data(handle, resume_file, router)
+        save_session(ses, session_file)
+        raise
+    finally:
+        # The session outlives this download, so take the torrent out of it
+        router.unsubscribe(queue)
+        ses.remove_torrent(handle)
+    
+    # Clean up the resume file on successful completion; the session file keeps the DHT state
+    try:
+        if _SessionFile(resume_file).remove():
+            logger.debug(f"Removed {resume_file} after successful download")
+    except OSError as e:
+        logger.warning(f"Could not remove {resume_file}: {e}")
+    
+    yield TorrentProgress(
+        name=torrent_name,
+        path=downloaded_path,
+        progress=100.0,
+        seeds=snap.seeds,
+        peers=snap.peers,
+        rate=snap.rate,
+        eta=0,
+        resumed=is_resuming,
+        finished=True
+    )
+
+
+def _format_eta(eta_seconds):
+    """Format an ETA in whole seconds as a short human-readable string."""
+    if eta_seconds is None:
+        return "N/A"
+    minutes, seconds = divmod(eta_seconds, 60)
+    if not minutes:
+        return f"{seconds}s"
+    hours, minutes = divmod(minutes, 60)
+    if not hours:
+        return f"{minutes}m {seconds}s"
+    return f"{hours}h {minutes}m"
+
+
+async def _print_download(downloads):
+    """
+    Print a progress line for each snapshot from iter_download().
+    
+    :param downloads: Async iterator of TorrentProgress snapshots.
+    :return: Path to downloaded content or None if the download did not finish.
+    """
+    is_resuming = True
+    last_fields = None
+    async for p in downloads:
+        if p.finished:
+            print()  # New line after progress bar completion
+            logger.info("Download complete!")
+            return p.path
+
+        # Determine label based on actual state
+        if is_resuming and p.resumed and p.progress < 95:
+            label = "Resuming Download"
+        elif p.rate == 0 and p.peers == 0:
+            label = "Connecting to Peers"
+        else:
+            label = "Download Progress"
+            is_resuming = False  # No longer resuming once we're actively downloading
+
+        # Only rebuild and redraw the line when something it shows has changed
+        fields = (label, int(p.progress * 10), p.seeds, p.peers, p.rate >> 10, p.eta)
+        if fields == last_fields:
+            continue
+        last_fields = fields
+
+        # Format download speed
+        if p.rate > MB:
+            speed_str = "%.2f MB/s" % (p.rate / MB)
+        else:
+            speed_str = "%.2f KB/s" % (p.rate / KB)
+
+        # Build complete progress bar string manually
+        filled_length = int(BAR_LENGTH * p.progress / 100)
+        bar = '█' * filled_length + '░' * (BAR_LENGTH - filled_length)
+        
+        # Use simple print instead of tqdm to avoid interference
+        print("\r%s: %s %.1f/100%%    | Seeds: %d | Peers: %d | Speed: %s | ETA: %s" % (
+            label, bar, p.progress, p.seeds, p.peers - p.seeds, speed_str, _format_eta(p.eta)
+        ), end="", flush=True)
+    return None
 
-            # Save session periodically (every 10 seconds)
-            if int(time.time()) % 10 == 0:
-                save_session(ses, session_file)
-            
-            time.sleep(1)
 
+def _run_in_thread(coro):
+    """
+    Run a coroutine with asyncio.run() on a worker thread and wait for its result.
+    
+    Used when the caller's thread already runs an event loop (e.g. a Jupyter or
+    Colab cell), where asyncio.run() would fail. On Ctrl+C the coroutine is
+    cancelled, so it can save its state, before KeyboardInterrupt is re-raised.
+    
+    :param coro: Coroutine to run.
+    :return: The coroutine's result.
+    """
+    outcome = {}
+    started = threading.Event()
+    done = threading.Event()
+    
+    async def runner():
+        outcome['loop'] = asyncio.get_running_loop()
+        outcome['task'] = asyncio.current_task()
+        started.set()
+        return await coro
+    
+    def target():
+        try:
+            outcome['result'] = asyncio.run(runner())
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            started.set()
+            done.set()
+    
+    thread = threading.Thread(target=target, name="torrent-download", daemon=True)
+    thread.start()
+    # Wait on an event rather than Thread.join(): a join interrupted by Ctrl+C can
+    # wrongly mark the thread as finished, and short waits keep Ctrl+C responsive
+    try:
+        while not done.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        started.wait()
+        try:
+            outcome['loop'].call_soon_threadsafe(outcome['task'].cancel)
+        except (KeyError, RuntimeError):
+            pass  # The download already finished and its loop is closed
+        done.wait()
+        raise
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+def download_torrent(source, download_path=TORRENT_DOWNLOAD_PATH, 
+                    session_file=TORRENT_SESSION_FILE, auto_resume=True,
+                    profile=PERFORMANCE_PROFILE, resume_dir=TORRENT_RESUME_DIR):
+    """
+    Download a torrent file using libtorrent, with support for stopping/resuming.
+    
+    Blocking wrapper around iter_download() that prints a progress line. It can
+    also be called from a thread that runs an event loop, such as a notebook cell.
+    
+    :param source: .torrent file path, http(s) URL of a .torrent file, magnet link,
+                   or the raw contents of a .torrent file (bytes, bytearray or memoryview).
+    :param download_path: Directory to save the downloaded content.
+    :param session_file: File to save/load session state.
+    :param auto_resume: Automatically load previous session if available.
+    :param profile: Performance profile, "balanced" or "high_perf".
+    :param resume_dir: Directory to save/load resume data in.
+    :return: Path to downloaded content or None on failure.
+    """
+    downloads = iter_download(source, download_path, session_file, auto_resume, profile, resume_dir)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        run = asyncio.run
+    else:
+        # Called from a running event loop, such as a notebook cell
+        run = _run_in_thread
+    try:
+        return run(_print_download(downloads))
     except KeyboardInterrupt:
         print()  # New line after progress bar
         logger.warning("Download paused by user. Session saved for resume.")
-        save_session(ses, session_file)
         return None
-    
-    print()  # New line after progress bar completion
 
-    logger.info("Download complete!")
-    
-    # Clean up session file on successful completion
-    if os.path.exists(session_file):
-        try:
-            os.remove(session_file)
-            logger.debug("Session file removed after successful download")
-        except Exception as e:
-            logger.warning(f"Could not remove session file: {e}")
-    
-    # Return the path to downloaded content
-    downloaded_path = os.path.join(download_path, torrent_name)
-    return downloaded_path
+
+def _resume_files(resume_dir):
+    """List the resume data files in a directory."""
+    try:
+        names = os.listdir(resume_dir)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(resume_dir, name) for name in names if name.endswith(".fastresume")]
 
 
-def get_download_status(session_file=TORRENT_SESSION_FILE):
+def get_download_status(session_file=TORRENT_SESSION_FILE, resume_dir=TORRENT_RESUME_DIR):
     """
     Check if there's a paused download that can be resumed.
     
-    :return: True if a session file exists, False otherwise.
+    :return: True if resume data exists for at least one torrent, False otherwise.
     """
-    return os.path.exists(session_file)
+    return bool(_resume_files(resume_dir))
 
 
-def clear_session(session_file=TORRENT_SESSION_FILE):
+def clear_session(session_file=TORRENT_SESSION_FILE, resume_dir=TORRENT_RESUME_DIR):
     """
-    Clear the session file to start fresh.
+    Clear the session file and every torrent's resume data to start fresh.
+    
+    The live shared session, if any, is left running.
     
     :return: True if cleared successfully, False otherwise.
     """
-    if os.path.exists(session_file):
+    for path in [session_file] + _resume_files(resume_dir):
         try:
-            os.remove(session_file)
-            logger.info("Session file cleared")
-            return True
-        except Exception as e:
+            if _SessionFile(path).remove():
+                logger.info(f"Cleared {path}")
+        except OSError as e:
             logger.error(f"Failed to clear session: {e}")
             return False
     return True